@@ -7,18 +7,25 @@ Usage:
     python3 auto_refresh.py                          # Use Pacific time (default)
     python3 auto_refresh.py --tz America/New_York    # Use Eastern time
     python3 auto_refresh.py --tz America/Chicago     # Use Central time
+
+Profiling (see profiling.py):
+    python3 profiling.py refresh profile    # cProfile this service and the fetches it runs
+    python3 profiling.py refresh timers     # Toggle hot-path timers
 """
 import subprocess
 import time
 import sys
 import argparse
+import profiling
 
 REFRESH_INTERVAL = 45  # 45 seconds
 
+@profiling.timed('fetch_data')
 def fetch_data(tz):
     """Run nwsl-live.py to fetch latest data"""
+    profiling.poll()
     try:
-        result = subprocess.run(['sudo', 'python3', 'nwsl-live.py', '--tz', tz],
+        result = subprocess.run(['sudo', 'python3', 'nwsl-live.py', '--tz', tz] + profiling.child_args(),
                                 capture_output=True,
                                 text=True,
                                 timeout=30,
@@ -37,7 +44,10 @@ def main():
     parser = argparse.ArgumentParser(description='NWSL Auto-Refresh Service')
     parser.add_argument('--tz', type=str, default='America/Los_Angeles',
                         help='Timezone (default: America/Los_Angeles). Examples: America/New_York, America/Chicago')
+    parser.add_argument('--profile-seconds', type=profiling.profile_seconds_arg, default=30,
+                        help='How long SIGUSR1 profiling runs (default: 30)')
     args = parser.parse_args()
+    profiling.install('refresh', profile_seconds=args.profile_seconds)
 
     print("=" * 60)
     print("NWSL Auto-Refresh Service")
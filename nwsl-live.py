@@ -2,13 +2,18 @@ import requests
 import pandas as pd
 from datetime import datetime, timedelta
 import os
+import time
 import argparse
 import pytz
+import profiling
 
 # ---------- CONFIG ----------
 season_year = 2025
 lookback_days = 14
 lookahead_days = 14
+# Overridable so replay_matchday.py can point the fetcher at a local API stand-in
+api_url = os.environ.get("NWSL_API_URL", "https://site.api.espn.com/apis/site/v2/sports/soccer/usa.nwsl/scoreboard")
+schedule_json = os.environ.get("NWSL_SCHEDULE_JSON", "/tmp/nwsl_schedule.json")
 
 # Team colors/logos
 team_lookup = pd.DataFrame({
@@ -40,12 +45,22 @@ team_lookup = pd.DataFrame({
 parser = argparse.ArgumentParser()
 parser.add_argument('--tz', type=str, default='America/Los_Angeles', 
                     help='Timezone for display (e.g., America/New_York, America/Chicago, America/Denver)')
+parser.add_argument('--now', type=str, default=None,
+                    help='Treat this ISO timestamp as the current time (used by replay_matchday.py)')
+parser.add_argument('--profile', action='store_true',
+                    help='Profile this run with cProfile and save the stats to /tmp')
+parser.add_argument('--timers', action='store_true',
+                    help='Print hot-path timings when done')
 args = parser.parse_args()
+profiling.run_once('fetch', profile=args.profile, timers=args.timers)
 
 # Get the target timezone
 target_tz = pytz.timezone(args.tz)
 print(f"Using timezone: {args.tz}")
 
+# Fixed "current time" for replays - live runs keep reading the clock below
+replay_now = datetime.fromisoformat(args.now) if args.now else None
+
 # ---------- HELPER ----------
 def safe_int(x):
     try:
@@ -53,8 +68,9 @@ def safe_int(x):
     except:
         return None
 
+@profiling.timed('get_games_for_date')
 def get_games_for_date(d):
-    url = f"https://site.api.espn.com/apis/site/v2/sports/soccer/usa.nwsl/scoreboard?dates={d.strftime('%Y%m%d')}"
+    url = f"{api_url}?dates={d.strftime('%Y%m%d')}"
     resp = requests.get(url)
     if resp.status_code != 200:
         return pd.DataFrame()
@@ -84,7 +100,8 @@ def get_games_for_date(d):
     return pd.DataFrame(rows)
 
 # ---------- PULL GAMES ----------
-dates = [datetime.now().date() - timedelta(days=lookback_days) + timedelta(days=i)
+today = (replay_now.astimezone() if replay_now else datetime.now()).date()
+dates = [today - timedelta(days=lookback_days) + timedelta(days=i)
          for i in range(lookback_days + lookahead_days + 1)]
 df_list = [get_games_for_date(d) for d in dates]
 df = pd.concat(df_list, ignore_index=True)
@@ -94,7 +111,7 @@ if df.empty:
     exit(0)
 
 # ---------- LOGIC: Show live game, recent completed, or next scheduled ----------
-now = datetime.now(target_tz)
+now = replay_now.astimezone(target_tz) if replay_now else datetime.now(target_tz)
 now_utc = now.astimezone(pytz.UTC)
 cutoff_time = now_utc - timedelta(hours=24)
 
@@ -102,6 +119,7 @@ cutoff_time = now_utc - timedelta(hours=24)
 games_to_show = []
 teams_with_games = set()  # Track teams that already have a game selected
 
+selection_start = time.perf_counter()
 for team in team_lookup['team']:
     # Skip if this team already has a game (from a live game that includes both teams)
     if team in teams_with_games:
@@ -170,6 +188,7 @@ for team in team_lookup['team']:
         print(f"  ✓ Added event {game_to_show['event_id']} to list")
     else:
         print(f"  ✗ Skipped event {game_to_show['event_id']} - already in list")
+profiling.record('selection', time.perf_counter() - selection_start)
 
 # Convert to DataFrame and remove duplicate events
 df_display = pd.DataFrame(games_to_show)
@@ -193,8 +212,9 @@ df_long['location'] = df_long['location'].map({'away_team': 'away_team', 'home_t
 team_games = df_long.merge(team_lookup, on="team", how="left")
 
 # ---------- SAVE JSON ----------
-team_games.to_json("/tmp/nwsl_schedule.json", orient="records", date_format="iso", indent=2)
-os.chmod("/tmp/nwsl_schedule.json", 0o666)
+with profiling.timer('to_json'):
+    team_games.to_json(schedule_json, orient="records", date_format="iso", indent=2)
+os.chmod(schedule_json, 0o666)
 print(f"✅ JSON saved with {len(games_to_show)} games to display!")
 print(f"   Games within 24hrs or next scheduled games shown")
 print(f"   Times displayed in: {args.tz}")
@@ -0,0 +1,249 @@
+"""
+On-demand profiling for the fetcher and display processes
+
+Long-running processes (auto_refresh.py, run_nwsl_scoreboard.py) call install(),
+which writes /tmp/nwsl_<name>.pid and listens for:
+    SIGUSR1 - start cProfile for N seconds, then dump stats to /tmp (send again to stop early)
+    SIGUSR2 - toggle hot-path timers; turning them off prints a summary
+
+    sudo python3 profiling.py display profile    # profile the display
+    sudo python3 profiling.py refresh timers     # time the fetcher
+    python3 -m pstats /tmp/nwsl_profile_display_<time>.prof
+
+The helper only signals the pid in the file if that process is still running
+the matching script, so a stale pid file can't hit an unrelated process.
+
+Signal handlers only queue the request. The process acts on it the next time
+its main loop calls poll(), so printing and dumping never interrupt a print.
+
+nwsl-live.py runs once per refresh, so auto_refresh.py passes its current
+state down with child_args() and the fetch reports at exit via run_once().
+Every profile session on the refresh service covers at least the next fetch,
+even when --profile-seconds is shorter than REFRESH_INTERVAL.
+Timers cost one flag check per call while off.
+"""
+import argparse
+import atexit
+import cProfile
+import functools
+import os
+import signal
+import sys
+import time
+
+PROFILE_DIR = '/tmp'
+SCRIPTS = {'refresh': 'auto_refresh.py', 'display': 'run_nwsl_scoreboard.py'}
+
+_name = None
+_profile_seconds = 30
+_profiler = None
+_profile_next_fetch = False  # the refresh service always profiles one fetch per SIGUSR1
+_pending = []  # actions queued by the signal handlers, run by poll()
+_timers_enabled = False
+_stats = {}  # label -> [calls, total seconds, max seconds]
+
+
+# ---------- HOT-PATH TIMERS ----------
+def record(label, elapsed):
+    """Add one timing to `label` - for blocks that can't use timer() or timed()"""
+    if not _timers_enabled:
+        # Timers are off, or were switched off while this block ran - its
+        # summary is already printed, so don't leak it into the next one
+        return
+    stat = _stats.setdefault(label, [0, 0.0, 0.0])
+    stat[0] += 1
+    stat[1] += elapsed
+    stat[2] = max(stat[2], elapsed)
+
+class timer:
+    """Context manager timing a block under `label` while timers are on"""
+    __slots__ = ('label', 'start')
+
+    def __init__(self, label):
+        self.label = label
+        self.start = None
+
+    def __enter__(self):
+        if _timers_enabled:
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.start is not None:
+            record(self.label, time.perf_counter() - self.start)
+        return False
+
+def timed(label):
+    """Decorator timing every call under `label` while timers are on"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _timers_enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(label, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+def print_timers():
+    """Print and reset the timer summary"""
+    print(f"⏱  Hot-path timers ({_name}):")
+    if not _stats:
+        print("   (no timed calls)")
+    for label, (calls, total, worst) in sorted(_stats.items()):
+        print(f"   {label:22} n={calls:<5} avg {total / calls * 1000:8.1f}ms  "
+              f"max {worst * 1000:8.1f}ms  total {total * 1000:9.1f}ms")
+    _stats.clear()
+
+def set_timers(enabled):
+    global _timers_enabled
+    if _timers_enabled and not enabled:
+        _timers_enabled = False
+        print_timers()
+    _timers_enabled = enabled
+
+
+# ---------- CPROFILE ----------
+def start_profile():
+    global _profiler
+    _profiler = cProfile.Profile()
+    _profiler.enable()
+
+def stop_profile():
+    """Stop cProfile and dump the stats to PROFILE_DIR"""
+    global _profiler
+    if _profiler is None:
+        return
+    _profiler.disable()
+    path = os.path.join(PROFILE_DIR, f"nwsl_profile_{_name}_{time.strftime('%Y%m%d-%H%M%S')}.prof")
+    _profiler.dump_stats(path)
+    _profiler = None
+    print(f"📊 Profile saved to {path}")
+
+
+# ---------- CONTROL ----------
+def child_args():
+    """Flags that pass the current profiling state on to a nwsl-live.py run"""
+    global _profile_next_fetch
+    args = []
+    if _profiler is not None or _profile_next_fetch:
+        args.append('--profile')
+        _profile_next_fetch = False
+    if _timers_enabled:
+        args.append('--timers')
+    return args
+
+def run_once(name, profile=False, timers=False):
+    """Profile and/or time a short-lived process until it exits"""
+    global _name
+    _name = name
+    if profile:
+        start_profile()
+        atexit.register(stop_profile)
+    if timers:
+        set_timers(True)
+        atexit.register(set_timers, False)
+
+def poll():
+    """Act on queued profiling signals - call from a safe point in the main loop"""
+    global _profile_next_fetch
+    while _pending:
+        action = _pending.pop(0)
+        if action == 'profile' and _profiler is not None:
+            signal.alarm(0)
+            stop_profile()
+        elif action == 'profile':
+            print(f"📊 Profiling {_name} for {_profile_seconds} seconds...")
+            start_profile()
+            signal.alarm(_profile_seconds)
+            _profile_next_fetch = True
+        elif action == 'alarm':
+            stop_profile()
+        elif action == 'timers':
+            set_timers(not _timers_enabled)
+            if _timers_enabled:
+                print(f"⏱  Hot-path timers on for {_name}")
+
+def profile_seconds_arg(value):
+    """argparse type for --profile-seconds - signal.alarm(0) would never stop the profile"""
+    try:
+        seconds = int(value)
+    except ValueError:
+        seconds = 0
+    if seconds <= 0:
+        raise argparse.ArgumentTypeError("profile seconds must be a positive whole number")
+    return seconds
+
+def install(name, profile_seconds=30):
+    """Register the SIGUSR1/SIGUSR2 handlers and write the pid file"""
+    global _name, _profile_seconds
+    _name = name
+    _profile_seconds = profile_seconds
+    pid_path = os.path.join(PROFILE_DIR, f"nwsl_{name}.pid")
+
+    def on_profile(signum, frame):
+        _pending.append('profile')
+
+    def on_alarm(signum, frame):
+        _pending.append('alarm')
+
+    def on_timers(signum, frame):
+        _pending.append('timers')
+
+    def on_terminate(signum, frame):
+        # main.py and stop_scoreboard.sh stop us with SIGTERM - exit normally so atexit runs
+        sys.exit(0)
+
+    def remove_pid_file():
+        if os.path.exists(pid_path):
+            os.remove(pid_path)
+
+    signal.signal(signal.SIGTERM, on_terminate)
+    signal.signal(signal.SIGUSR1, on_profile)
+    signal.signal(signal.SIGALRM, on_alarm)
+    signal.signal(signal.SIGUSR2, on_timers)
+    try:
+        with open(pid_path, 'w') as f:
+            f.write(str(os.getpid()))
+        atexit.register(remove_pid_file)
+    except OSError as e:
+        print(f"⚠️  Could not write {pid_path}: {e}")
+    print(f"Profiling: python3 profiling.py {name} profile|timers (cProfile runs {profile_seconds}s)")
+
+def signal_process(name, signum):
+    """Send `signum` to the process in /tmp/nwsl_<name>.pid if it is still ours"""
+    pid_path = os.path.join(PROFILE_DIR, f"nwsl_{name}.pid")
+    try:
+        with open(pid_path, 'r') as f:
+            pid = int(f.read().strip())
+    except (OSError, ValueError):
+        print(f"Error: no valid pid file at {pid_path} - is {SCRIPTS[name]} running?")
+        return False
+
+    try:
+        with open(f"/proc/{pid}/cmdline", 'rb') as f:
+            argv = f.read().decode(errors='replace').split('\0')
+    except OSError:
+        argv = ['']
+    is_ours = ('python' in os.path.basename(argv[0]) and
+               any(os.path.basename(arg) == SCRIPTS[name] for arg in argv[1:]))
+    if not is_ours:
+        print(f"Error: pid {pid} in {pid_path} is not a running {SCRIPTS[name]} - ignoring stale file")
+        return False
+
+    os.kill(pid, signum)
+    print(f"Sent {signal.Signals(signum).name} to {SCRIPTS[name]} (pid {pid})")
+    return True
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Profile a running NWSL scoreboard process')
+    parser.add_argument('process', choices=sorted(SCRIPTS), help='Which process to signal')
+    parser.add_argument('action', choices=['profile', 'timers'],
+                        help='profile: start/stop cProfile, timers: toggle hot-path timers')
+    args = parser.parse_args()
+
+    signum = signal.SIGUSR1 if args.action == 'profile' else signal.SIGUSR2
+    sys.exit(0 if signal_process(args.process, signum) else 1)
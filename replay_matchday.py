@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+Matchday replay harness - measures end-to-end goal and state-change latency
+Records ESPN scoreboard responses during a real matchday, then replays them
+through a local API stand-in with a virtual clock running 1x-100x faster.
+The real nwsl-live.py fetcher and NWSLScoreboard display loop run against
+the stand-in, drawing onto a virtual panel instead of the LED matrix.
+
+Usage:
+    python3 replay_matchday.py record matchday.json                     # Poll today's games every 15 seconds
+    python3 replay_matchday.py record matchday.json --dates 20250614    # Record a specific date
+    python3 replay_matchday.py replay matchday.json --speed 20          # Replay at 20x
+    python3 replay_matchday.py replay matchday.json --team SD --report latency.json
+
+Latencies are in virtual seconds. The virtual clock drops to 1x while each
+nwsl-live.py fetch runs, so fetch time counts once whatever the --speed and
+the report stays comparable across speeds.
+"""
+import argparse
+import bisect
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import types
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from auto_refresh import REFRESH_INTERVAL
+
+ESPN_URL = "https://site.api.espn.com/apis/site/v2/sports/soccer/usa.nwsl/scoreboard"
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class ReplayFinished(Exception):
+    """Raised from VirtualClock.sleep once the replay window is over"""
+
+
+class VirtualClock:
+    """Drop-in for the `time` module calls the display loop makes"""
+    def __init__(self, start, end, speed):
+        self.end = end
+        self.speed = speed
+        self._anchor = (time.time(), start, speed)  # (real, virtual, rate) - swapped atomically
+
+    def time(self):
+        real, virtual, rate = self._anchor
+        return virtual + (time.time() - real) * rate
+
+    def set_rate(self, rate):
+        now = time.time()
+        real, virtual, old_rate = self._anchor
+        self._anchor = (now, virtual + (now - real) * old_rate, rate)
+
+    @contextmanager
+    def real_time(self):
+        """Run the clock at 1x for the duration, so the work costs what it would live"""
+        self.set_rate(1)
+        try:
+            yield
+        finally:
+            self.set_rate(self.speed)
+
+    def sleep(self, seconds):
+        deadline = self.time() + seconds
+        while True:
+            now = self.time()
+            if now >= self.end:
+                raise ReplayFinished()
+            if now >= deadline:
+                return
+            # Short real sleeps so a rate change mid-sleep is picked up
+            time.sleep(min((deadline - now) / self._anchor[2], 0.05))
+
+    def strftime(self, fmt, t=None):
+        return time.strftime(fmt, time.localtime(self.time() if t is None else t))
+
+    def isoformat(self, t=None):
+        return datetime.fromtimestamp(self.time() if t is None else t, tz=timezone.utc).isoformat()
+
+
+# ---------- RECORDING ----------
+def safe_int(x):
+    try:
+        return int(x)
+    except (TypeError, ValueError):
+        return None
+
+def load_recording(path):
+    """Load a recording as {date: ([at, ...], [response, ...])} sorted by time"""
+    with open(path, 'r') as f:
+        frames = json.load(f)["frames"]
+    frames.sort(key=lambda frame: frame["at"])
+    timeline = {}
+    for frame in frames:
+        at = datetime.fromisoformat(frame["at"]).timestamp()
+        times, responses = timeline.setdefault(frame["dates"], ([], []))
+        times.append(at)
+        responses.append(frame["response"])
+    return timeline
+
+def record(path, dates, interval):
+    """Poll the ESPN API and append a frame whenever a date's events change"""
+    import requests
+
+    frames = []
+    last_events = {}
+    print(f"Recording {', '.join(dates)} to {path} every {interval} seconds")
+    print("Press Ctrl+C to stop")
+    try:
+        while True:
+            for d in dates:
+                try:
+                    resp = requests.get(f"{ESPN_URL}?dates={d}", timeout=10)
+                    if resp.status_code != 200:
+                        continue
+                    events = resp.json().get("events", [])
+                except (requests.RequestException, ValueError) as e:
+                    # Skip a bad poll rather than end a live recording
+                    print(f"[{time.strftime('%H:%M:%S')}] ❌ Error fetching {d}: {e}")
+                    continue
+                if events == last_events.get(d):
+                    continue
+                last_events[d] = events
+                frames.append({
+                    "at": datetime.now(timezone.utc).isoformat(),
+                    "dates": d,
+                    "response": {"events": events}
+                })
+                with open(path, 'w') as f:
+                    json.dump({"frames": frames}, f)
+                print(f"[{time.strftime('%H:%M:%S')}] Recorded frame {len(frames)} for {d}")
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print(f"\nStopped recording - {len(frames)} frames saved")
+
+def expected_changes(timeline):
+    """Walk the recording and list every goal and state change with the time it first appeared"""
+    frames = sorted(
+        (at, response)
+        for times, responses in timeline.values()
+        for at, response in zip(times, responses)
+    )
+    last = {}
+    changes = []
+    for at, response in frames:
+        for game in response.get("events", []):
+            comp = game["competitions"][0]
+            home = next((c for c in comp["competitors"] if c["homeAway"] == "home"), {})
+            away = next((c for c in comp["competitors"] if c["homeAway"] == "away"), {})
+            event_id = comp.get("id")
+            current = {
+                "state": game.get("status", {}).get("type", {}).get("state"),
+                "home_score": safe_int(home.get("score")),
+                "away_score": safe_int(away.get("score")),
+            }
+            matchup = f"{away.get('team', {}).get('abbreviation')} @ {home.get('team', {}).get('abbreviation')}"
+            prev = last.get(event_id)
+            last[event_id] = current
+            if not prev:
+                continue
+
+            base = {"at": at, "event_id": event_id, "matchup": matchup, **current}
+            if current["state"] != prev["state"]:
+                changes.append({**base, "kind": "state", "detail": f"{prev['state']} -> {current['state']}"})
+            if (current["home_score"] or 0) > (prev["home_score"] or 0):
+                changes.append({**base, "kind": "goal", "detail": f"{home.get('team', {}).get('abbreviation')} scored"})
+            if (current["away_score"] or 0) > (prev["away_score"] or 0):
+                changes.append({**base, "kind": "goal", "detail": f"{away.get('team', {}).get('abbreviation')} scored"})
+    return changes
+
+
+# ---------- API STAND-IN ----------
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves the latest recorded response for ?dates= as of the virtual clock"""
+    def do_GET(self):
+        d = parse_qs(urlparse(self.path).query).get("dates", [""])[0]
+        times, responses = self.server.timeline.get(d, ([], []))
+        i = bisect.bisect_right(times, self.server.clock.time())
+        body = json.dumps(responses[i - 1] if i else {"events": []}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# ---------- VIRTUAL PANEL ----------
+class VirtualCanvas:
+    def Clear(self):
+        pass
+
+    def SetPixel(self, x, y, r, g, b):
+        pass
+
+class VirtualMatrix:
+    """Stands in for RGBMatrix - each SwapOnVSync counts as the frame reaching the panel"""
+    def __init__(self, on_swap):
+        self.on_swap = on_swap
+
+    def SwapOnVSync(self, canvas):
+        self.on_swap()
+        return canvas
+
+    def Clear(self):
+        pass
+
+def load_display_module(clock):
+    """Import run_nwsl_scoreboard against a virtual rgbmatrix and clock"""
+    sys.modules['rgbmatrix'] = types.SimpleNamespace(
+        RGBMatrix=None,
+        RGBMatrixOptions=None,
+        graphics=types.SimpleNamespace(
+            Color=lambda r, g, b: (r, g, b),
+            DrawText=lambda canvas, font, x, y, color, text: None,
+        ),
+    )
+    import run_nwsl_scoreboard
+    run_nwsl_scoreboard.time = clock
+    return run_nwsl_scoreboard
+
+
+# ---------- REPLAY ----------
+def matchup_snapshot(matchup):
+    home_team = next((t for t in matchup if t['location'] == 'home_team'), matchup[0])
+    return {
+        "event_id": home_team['event_id'],
+        "state": home_team['state'],
+        "home_score": home_team['home_score'],
+        "away_score": home_team['away_score'],
+    }
+
+def shows_change(snapshot, change):
+    """True once a published/displayed snapshot reflects a recorded change"""
+    if snapshot["event_id"] != change["event_id"]:
+        return False
+    if change["kind"] == "state":
+        return snapshot["state"] == change["state"]
+    return ((snapshot["home_score"] or 0) >= (change["home_score"] or 0) and
+            (snapshot["away_score"] or 0) >= (change["away_score"] or 0))
+
+def first_latency(log, change, kind=None):
+    for at, snapshot in log:
+        if at >= change["at"] and (kind is None or snapshot.get("kind") == kind) and shows_change(snapshot, change):
+            return at - change["at"]
+    return None
+
+def replay(path, speed, tz, team, tail, report_path):
+    timeline = load_recording(path)
+    changes = expected_changes(timeline)
+    if team:
+        # Other teams' games are filtered off the panel by design
+        changes = [c for c in changes if team in c["matchup"].split(" @ ")]
+    all_times = [at for times, _ in timeline.values() for at in times]
+    if not all_times:
+        print(f"Error: {path} has no recorded frames")
+        sys.exit(1)
+
+    clock = VirtualClock(min(all_times), max(all_times) + tail, speed)
+    published = []  # (virtual time, snapshot) per event after each fetch
+    displayed = []  # (virtual time, snapshot) per panel swap
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.timeline = timeline
+    server.clock = clock
+    json_path = None
+    try:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        json_fd, json_path = tempfile.mkstemp(prefix="nwsl_replay_", suffix=".json")
+        os.close(json_fd)
+        env = dict(os.environ,
+                   NWSL_API_URL=f"http://127.0.0.1:{server.server_address[1]}/scoreboard",
+                   NWSL_SCHEDULE_JSON=json_path)
+
+        print("=" * 60)
+        print("NWSL Matchday Replay")
+        print(f"Recording: {path} ({len(all_times)} frames, {len(changes)} changes)")
+        print(f"Virtual time: {clock.strftime('%Y-%m-%d %H:%M:%S')} at {speed:g}x")
+        print("=" * 60)
+
+        def fetch_data():
+            """Same as auto_refresh.fetch_data, pointed at the stand-in and virtual clock"""
+            # nwsl-live.py exits without writing when it finds no games - clear the
+            # last output first so those runs aren't recorded as re-publishing it
+            if os.path.exists(json_path):
+                os.remove(json_path)
+            try:
+                with clock.real_time():
+                    subprocess.run([sys.executable, os.path.join(SCRIPT_DIR, 'nwsl-live.py'),
+                                    '--tz', tz, '--now', clock.isoformat()],
+                                   env=env, capture_output=True, text=True, timeout=30, check=True)
+                    at = clock.time()
+            except (subprocess.TimeoutExpired, subprocess.CalledProcessError) as e:
+                print(f"[{clock.strftime('%H:%M:%S')}] ❌ Error fetching data: {e}")
+                return
+            try:
+                with open(json_path, 'r') as f:
+                    rows = json.load(f)
+            except (OSError, ValueError):
+                print(f"[{clock.strftime('%H:%M:%S')}] ⚠️  Fetch published nothing")
+                return
+            published.extend((at, matchup_snapshot([row])) for row in rows if row['location'] == 'home_team')
+            print(f"[{clock.strftime('%H:%M:%S')}] Published {len(rows) // 2} games")
+
+        def refresh_loop():
+            try:
+                while True:
+                    clock.sleep(REFRESH_INTERVAL)
+                    fetch_data()
+            except ReplayFinished:
+                pass
+
+        display_module = load_display_module(clock)
+
+        class VirtualScoreboard(display_module.NWSLScoreboard):
+            def setup_matrix(self):
+                self.font = self.small_font = None
+                self.matrix = VirtualMatrix(self.on_swap)
+                self.canvas = VirtualCanvas()
+                self.on_panel = None
+
+            def on_swap(self):
+                if self.on_panel:
+                    displayed.append((clock.time(), self.on_panel))
+
+            def check_for_goals(self, matchup):
+                self.on_panel = None
+                scoring_team = super().check_for_goals(matchup)
+                if scoring_team:
+                    self.on_panel = {**matchup_snapshot(matchup), "kind": "goal"}
+                return scoring_team
+
+            def draw_matchup(self, matchup):
+                self.on_panel = {**matchup_snapshot(matchup), "kind": "matchup"}
+                super().draw_matchup(matchup)
+
+        def display_loop():
+            try:
+                VirtualScoreboard(favorite_team=team, json_path=json_path).run()
+            except ReplayFinished:
+                pass
+
+        # Initial fetch before the display starts, as main.py does
+        fetch_data()
+        if not published:
+            print("Error: initial fetch published nothing - check the recording dates")
+            sys.exit(1)
+        threads = [threading.Thread(target=refresh_loop, daemon=True),
+                   threading.Thread(target=display_loop, daemon=True)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        server.shutdown()
+        server.server_close()
+        if json_path and os.path.exists(json_path):
+            os.remove(json_path)
+
+    # ---------- REPORT ----------
+    results = []
+    for change in changes:
+        results.append({
+            **change,
+            "at": clock.isoformat(change["at"]),
+            "published_latency": first_latency(published, change),
+            "panel_latency": first_latency(displayed, change),
+            "animation_latency": first_latency(displayed, change, "goal") if change["kind"] == "goal" else None,
+        })
+
+    def fmt(latency):
+        return "missed" if latency is None else f"+{latency:.0f}s"
+
+    print("\n" + "=" * 60)
+    print(f"Replay Latency Report ({speed:g}x, virtual seconds)")
+    print("=" * 60)
+    for result in results:
+        line = (f"{result['at'][11:19]}  {result['kind'].upper():5}  {result['matchup']:10}  {result['detail']:12}"
+                f"  published {fmt(result['published_latency']):>7}  panel {fmt(result['panel_latency']):>7}")
+        if result["kind"] == "goal":
+            line += f"  animation {fmt(result['animation_latency']):>7}"
+        print(line)
+
+    for kind in ("goal", "state"):
+        latencies = [r["panel_latency"] for r in results if r["kind"] == kind]
+        shown = [l for l in latencies if l is not None]
+        if not latencies:
+            continue
+        summary = f"{kind.capitalize()}s: {len(shown)}/{len(latencies)} reached the panel"
+        if shown:
+            summary += f" - median +{statistics.median(shown):.0f}s, max +{max(shown):.0f}s"
+        print(summary)
+
+    if report_path:
+        with open(report_path, 'w') as f:
+            json.dump({"speed": speed, "team": team, "changes": results}, f, indent=2)
+        print(f"Report saved to {report_path}")
+
+def speed_arg(value):
+    speed = float(value)
+    if not 1 <= speed <= 100:
+        raise argparse.ArgumentTypeError("speed must be between 1 and 100")
+    return speed
+
+def main():
+    parser = argparse.ArgumentParser(description='NWSL Matchday Replay Harness')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = subparsers.add_parser('record', help='Record live scoreboard responses to a file')
+    record_parser.add_argument('path', help='Recording file to write')
+    record_parser.add_argument('--dates', nargs='+', default=[datetime.now().strftime('%Y%m%d')],
+                               help='Scoreboard dates to poll as YYYYMMDD (default: today)')
+    record_parser.add_argument('--interval', type=int, default=15,
+                               help='Seconds between polls (default: 15)')
+
+    replay_parser = subparsers.add_parser('replay', help='Replay a recording and report latency')
+    replay_parser.add_argument('path', help='Recording file to replay')
+    replay_parser.add_argument('--speed', type=speed_arg, default=10,
+                               help='Virtual clock speed, 1-100 (default: 10)')
+    replay_parser.add_argument('--tz', type=str, default='America/Los_Angeles',
+                               help='Timezone (default: America/Los_Angeles)')
+    replay_parser.add_argument('--team', type=str,
+                               help='Filter by favorite team (e.g., SD, BAY, CHI)')
+    replay_parser.add_argument('--tail', type=int, default=180,
+                               help='Virtual seconds to keep running after the last frame (default: 180)')
+    replay_parser.add_argument('--report', type=str,
+                               help='Also write the latency report as JSON to this file')
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        record(args.path, args.dates, args.interval)
+    else:
+        replay(args.path, args.speed, args.tz, args.team, args.tail, args.report)
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,10 @@
 """
 NWSL LED Scoreboard Display
 Displays game information on RGB LED matrix
+
+Profiling (see profiling.py):
+    sudo python3 profiling.py display profile    # cProfile the display loop
+    sudo python3 profiling.py display timers     # Toggle hot-path timers
 """
 import json
 import time
@@ -9,12 +13,16 @@ import os
 import sys
 import argparse
 import pandas as pd
+import profiling
 from rgbmatrix import RGBMatrix, RGBMatrixOptions, graphics
 
+SCHEDULE_JSON = '/tmp/nwsl_schedule.json'
+
 class NWSLScoreboard:
-    def __init__(self, favorite_team=None):
+    def __init__(self, favorite_team=None, json_path=SCHEDULE_JSON):
         print("Starting initialization...")
         self.favorite_team = favorite_team
+        self.json_path = json_path
         self.previous_scores = {}
         
         # Team color schemes - home colors for backgrounds, away colors for text
@@ -39,16 +47,20 @@ class NWSLScoreboard:
             print(f"Filtering for favorite team: {favorite_team}")
         
         # Load schedule data
-        json_path = '/tmp/nwsl_schedule.json'
-        if not os.path.exists(json_path):
-            print(f"Error: {json_path} not found!")
+        if not os.path.exists(self.json_path):
+            print(f"Error: {self.json_path} not found!")
             print("Run 'sudo python3 main.py' first to fetch game data")
             sys.exit(1)
             
-        with open(json_path, 'r') as f:
+        with open(self.json_path, 'r') as f, profiling.timer('json.load'):
             self.schedule_data = json.load(f)
         print(f"Loaded {len(self.schedule_data)} games")
         
+        self.setup_matrix()
+        print("Initialization complete!")
+    
+    def setup_matrix(self):
+        """Load fonts and configure the LED matrix"""
         # FIXED: Find font directory - check multiple possible locations
         script_dir = os.path.dirname(os.path.abspath(__file__))
         possible_font_dirs = [
@@ -91,13 +103,13 @@ class NWSLScoreboard:
         
         self.matrix = RGBMatrix(options=options)
         self.canvas = self.matrix.CreateFrameCanvas()
-        print("Initialization complete!")
     
     def hex_to_color(self, hex_color):
         """Convert hex color to RGB tuple"""
         hex_color = hex_color.lstrip('#')
         return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
     
+    @profiling.timed('group_games_by_event')
     def group_games_by_event(self):
         """Group games by event_id and filter by favorite team if specified"""
         events = {}
@@ -165,6 +177,7 @@ class NWSLScoreboard:
         self.canvas = self.matrix.SwapOnVSync(self.canvas)
         time.sleep(15)  # Show goal celebration for 15 seconds
     
+    @profiling.timed('draw_matchup')
     def draw_matchup(self, matchup):
         """Draw game information on LED matrix"""
         if len(matchup) < 2:
@@ -265,8 +278,7 @@ class NWSLScoreboard:
                 # Reload data every 45 seconds
                 if time.time() - last_reload >= 45:
                     try:
-                        json_path = '/tmp/nwsl_schedule.json'
-                        with open(json_path, 'r') as f:
+                        with open(self.json_path, 'r') as f, profiling.timer('json.load'):
                             self.schedule_data = json.load(f)
                         print(f"[{time.strftime('%H:%M:%S')}] Reloaded schedule data")
                         last_reload = time.time()
@@ -276,11 +288,13 @@ class NWSLScoreboard:
                 matchups = self.group_games_by_event()
                 
                 if not matchups:
+                    profiling.poll()
                     print("No games to display")
                     time.sleep(10)
                     continue
                 
                 for i, matchup in enumerate(matchups):
+                    profiling.poll()
                     # Check for goals
                     scoring_team = self.check_for_goals(matchup)
                     if scoring_team:
@@ -299,7 +313,10 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='NWSL LED Scoreboard')
     parser.add_argument('--team', type=str, 
                         help='Filter by favorite team (e.g., SD, BAY, CHI)')
+    parser.add_argument('--profile-seconds', type=profiling.profile_seconds_arg, default=30,
+                        help='How long SIGUSR1 profiling runs (default: 30)')
     args = parser.parse_args()
+    profiling.install('display', profile_seconds=args.profile_seconds)
     
     scoreboard = NWSLScoreboard(favorite_team=args.team)
     scoreboard.run()